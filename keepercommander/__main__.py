@@ -21,31 +21,36 @@ import logging
 import base64
 
 from . import __version__
-from .params import KeeperParams
-
-from . import cli
 
+_ARGV0_RE = re.compile(r'(-script\.pyw?|\.exe)$')
 
 
 def usage(m):
+    from . import cli
+
     print(m)
     parser.print_help()
     cli.display_command_help(show_enterprise=True, show_shell=True)
     sys.exit(1)
 
 
-parser = argparse.ArgumentParser(prog='keeper', add_help=False, allow_abbrev=False)
-parser.add_argument('--server', '-ks', dest='server', action='store', help='Keeper Host address.')
-parser.add_argument('--user', '-ku', dest='user', action='store', help='Email address for the account.')
-parser.add_argument('--password', '-kp', dest='password', action='store', help='Master password for the account.')
-parser.add_argument('--version', dest='version', action='store_true', help='Display version')
-parser.add_argument('--config', dest='config', action='store', help='Config file to use')
-parser.add_argument('--debug', dest='debug', action='store_true', help='Turn on debug mode')
-parser.add_argument('--batch-mode', dest='batch_mode', action='store_true', help='Run commander in batch or basic UI mode.')
-parser.add_argument('--login-v3', '-lv3', dest='login_v3', action='store', help='Use Login v3 to login to Keeper.')
-parser.add_argument('command', nargs='?', type=str, action='store', help='Command')
-parser.add_argument('options', nargs='*', action='store', help='Options')
-parser.error = usage
+parser = None    # type: argparse.ArgumentParser
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog='keeper', add_help=False, allow_abbrev=False)
+    parser.add_argument('--server', '-ks', dest='server', action='store', help='Keeper Host address.')
+    parser.add_argument('--user', '-ku', dest='user', action='store', help='Email address for the account.')
+    parser.add_argument('--password', '-kp', dest='password', action='store', help='Master password for the account.')
+    parser.add_argument('--version', dest='version', action='store_true', help='Display version')
+    parser.add_argument('--config', dest='config', action='store', help='Config file to use')
+    parser.add_argument('--debug', dest='debug', action='store_true', help='Turn on debug mode')
+    parser.add_argument('--batch-mode', dest='batch_mode', action='store_true', help='Run commander in batch or basic UI mode.')
+    parser.add_argument('--login-v3', '-lv3', dest='login_v3', action='store', help='Use Login v3 to login to Keeper.')
+    parser.add_argument('command', nargs='?', type=str, action='store', help='Command')
+    parser.add_argument('options', nargs='*', action='store', help='Options')
+    parser.error = usage
+    return parser
 
 
 def handle_exceptions(exc_type, exc_value, exc_traceback):
@@ -55,23 +60,39 @@ def handle_exceptions(exc_type, exc_value, exc_traceback):
     sys.exit(-1)
 
 
+def _is_version_request(args):
+    for arg in args:
+        if arg == '--':
+            break
+        if arg == '--version':
+            return True
+    return False
+
+
 def main(from_package=False):
+    global parser
     errno = 0
 
     if from_package:
         sys.excepthook = handle_exceptions
 
-    sys.argv[0] = re.sub(r'(-script\.pyw?|\.exe)?$', '', sys.argv[0])
+    if sys.argv[0].endswith(('.exe', '.py', '.pyw')):
+        sys.argv[0] = _ARGV0_RE.sub('', sys.argv[0])
 
+    if _is_version_request(sys.argv[1:]):
+        print('Keeper Commander, version {0}'.format(__version__))
+        return
+
+    logging.basicConfig(format='%(message)s')
+
+    from .params import KeeperParams
+
+    parser = _build_parser()
     opts, flags = parser.parse_known_args(sys.argv[1:])
     params = KeeperParams.from_config(opts.config)
 
     if opts.debug:
-        params.debug = opts.debug
-        is_debug = logging.getLogger().level <= logging.DEBUG
-        logging.getLogger().setLevel((logging.WARNING if params.batch_mode else logging.INFO) if is_debug else logging.DEBUG)
-        logging.info('Debug %s', 'OFF' if is_debug else 'ON')
-
+        params.debug = True
 
     if opts.batch_mode:
         params.batch_mode = True
@@ -92,10 +113,6 @@ def main(from_package=False):
         if pwd:
             params.password = pwd
 
-    if opts.version:
-        print('Keeper Commander, version {0}'.format(__version__))
-        return
-
     if flags and len(flags) > 0:
         if flags[0] == '-h':
             flags.clear()
@@ -108,15 +125,12 @@ def main(from_package=False):
         if opts.command == '?' or not params.commands:
             usage('')
 
-    logging.basicConfig(level=logging.WARNING if params.batch_mode else logging.INFO, format='%(message)s')
-
-    if params.timedelay >= 1 and params.commands:
-        cli.runcommands(params)
-    else:
+    run_commands = params.timedelay >= 1 and params.commands
+    if not run_commands:
         if opts.command not in {'shell', '-'}:
             if opts.command:
-                flags = ' '.join([shlex.quote(x) for x in flags]) if flags is not None else ''
-                options = ' '.join([shlex.quote(x) for x in opts.options]) if opts.options is not None else ''
+                flags = ' '.join(shlex.quote(x) for x in flags) if flags else ''
+                options = ' '.join(shlex.quote(x) for x in opts.options) if opts.options else ''
                 command = ' '.join([opts.command, flags])
                 if options:
                     command += ' -- ' + options
@@ -127,6 +141,19 @@ def main(from_package=False):
             if opts.command == '-':
                 params.batch_mode = True
 
+    if params.debug:
+        log_level = logging.DEBUG
+    else:
+        log_level = logging.WARNING if params.batch_mode else logging.INFO
+    logging.getLogger().setLevel(log_level)
+    if params.debug:
+        logging.debug('Debug ON')
+
+    from . import cli
+
+    if run_commands:
+        cli.runcommands(params)
+    else:
         errno = cli.loop(params)
 
     sys.exit(errno)
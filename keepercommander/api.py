@@ -167,9 +167,8 @@ def login(params):
             if params.config.get('device_id') != device_id:
                 store_config = True
                 params.config['device_id'] = device_id
-                url1 = urllib.parse.urlsplit(params.server)
-                url2 = urllib.parse.urlsplit(params.rest_context.server_base)
-                if url1.netloc != url2.netloc:
+                url = urllib.parse.urlsplit(params.rest_context.server_base)
+                if params.domain != url.netloc:
                     params.config['server'] = params.rest_context.server_base
 
             params.license = response_json.get('license')
@@ -429,8 +429,6 @@ def loop(params):  # type: (KeeperParams) -> int
                                            complete_while_typing=False)
 
         display.welcome()
-    else:
-        logging.getLogger().setLevel(logging.WARNING)
 
     if params.user:
         if len(params.commands) == 0:
@@ -21,7 +21,6 @@ import requests
 import tempfile
 import json
 
-from urllib.parse import urlsplit
 
 from google.protobuf.json_format import MessageToDict
 from tabulate import tabulate
@@ -361,8 +360,7 @@ class WhoamiCommand(Command):
         is_verbose = kwargs.get('verbose') or False
         if is_verbose:
             if params.server:
-                parts = urlsplit(params.server)
-                host = parts[1]
+                host = params.domain
                 cp = host.rfind(':')
                 if cp > 0:
                     host = host[:cp]
@@ -13,20 +13,35 @@ import base64
 import logging
 from urllib.parse import urlparse, urlunparse
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 LAST_RECORD_UID = 'last_record_uid'
 LAST_SHARED_FOLDER_UID = 'last_shared_folder_uid'
 LAST_FOLDER_UID = 'last_folder_uid'
 LAST_TEAM_UID = 'last_team_uid'
 
+_AUDIT_KEYS = frozenset(('record_uid', 'file_format', 'attachment_id', 'to_username'))
+
 
 class RestApiContext:
+    __slots__ = ('__server_base', 'transmission_key', 'server_key_id', 'locale', 'device_id', '_store_server_key')
+
     def __init__(self, server='https://keepersecurity.com/api/v2/', locale='en_US', device_id=None):
         self.server_base = server
         self.transmission_key = None
-        self.__server_key_id = 1
+        self.server_key_id = 1
         self.locale = locale
-        self.__device_id = device_id
-        self.__store_server_key = False
+        self.device_id = device_id
+        self._store_server_key = False
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if key in ('device_id', 'server_key_id'):
+            object.__setattr__(self, '_store_server_key', True)
 
     def __get_server_base(self):
         return self.__server_base
@@ -35,40 +50,65 @@ class RestApiContext:
         p = urlparse(value)
         self.__server_base = urlunparse((p.scheme, p.netloc, '/api/rest/', None, None, None))
 
-    def __get_server_key_id(self):
-        return self.__server_key_id
-
-    def __set_server_key_id(self, key_id):
-        self.__server_key_id = key_id
-        self.__store_server_key = True
-
-    def __get_device_id(self):
-        return self.__device_id
-
-    def __set_device_id(self, device_id):
-        self.__device_id = device_id
-        self.__store_server_key = True
-
     def __get_store_server_key(self):
-        return self.__store_server_key
+        return self._store_server_key
 
     server_base = property(__get_server_base, __set_server_base)
-    device_id = property(__get_device_id, __set_device_id)
-    server_key_id = property(__get_server_key_id, __set_server_key_id)
     store_server_key = property(__get_store_server_key)
 
 
-import enum
-
-
-class MfaType(enum.Enum):
-    device_token = 1
-
-
 class KeeperParams:
     """ Global storage of data during the session """
     DEFAULT_ENDPOINT = 'https://keepersecurity.com/api/v2/'
 
+    # session collections: created in __init__, emptied by clear_session
+    _COLLECTIONS = (
+        ('commands', list),
+        ('record_cache', dict),
+        ('meta_data_cache', dict),
+        ('shared_folder_cache', dict),
+        ('team_cache', dict),
+        ('key_cache', dict),  # team or user
+        ('subfolder_cache', dict),
+        ('subfolder_record_cache', dict),
+        ('non_shared_data_cache', dict),
+        ('folder_cache', dict),
+        ('pending_share_requests', set),
+        ('environment_variables', dict),
+        ('record_history', dict),  # record_uid -> (list[dict], int)
+        ('event_queue', list),
+    )
+
+    # scalar values restored by clear_session
+    _CLEAR_STATE = {
+        'auth_verifier': '',
+        'user': '',
+        'password': '',
+        'mfa_type': 'device_token',
+        'mfa_token': '',
+        'session_token': None,
+        'salt': None,
+        'iterations': 0,
+        'data_key': None,
+        'rsa_key': None,
+        'revision': 0,
+        'available_team_cache': None,
+        'root_folder': None,
+        'current_folder': None,
+        'sync_data': True,
+        'license': None,
+        'settings': None,
+        'enforcements': None,
+        'enterprise': None,
+        'enterprise_id': 0,
+        'msp_tree_key': None,
+        'prepare_commands': True,
+        'batch_mode': False,
+        'clone_code': None,
+        'device_token': None,
+        'device_private_key': None,
+    }
+
     def __init__(self, config_filename='', *,
                  user: str = '',
                  server: str = DEFAULT_ENDPOINT,
@@ -92,33 +132,33 @@ class KeeperParams:
             commands = []
         else:
             assert type(commands) is list
-            assert all([type(cmd) is dict for cmd in commands])
+            assert all(type(cmd) is dict for cmd in commands)
 
         if plugins is None:
             plugins = list()
         else:
             assert type(plugins) is list
-            assert all([type(plugin) is dict for plugin in plugins])
-
-        if debug:
-            debug = True
-            logging.getLogger().setLevel(logging.DEBUG)
-            logging.debug('Debug ON')
+            assert all(type(plugin) is dict for plugin in plugins)
 
         if not mfa_type:
             mfa_type = 'device_token'
 
-        device_id = base64.urlsafe_b64decode(device_id + '==')
+        if not device_id:
+            device_id = b''
+        elif isinstance(device_id, str):
+            device_id = base64.urlsafe_b64decode(device_id + '=' * (-len(device_id) % 4))
 
         self.config_filename = config_filename
         self.config = config
         self.auth_verifier = None
         self.__server = server
+        self.__domain = urlparse(server or '').netloc
         self.user = user.lower()
+        for name, factory in self._COLLECTIONS:
+            setattr(self, name, factory())
         self.password = password
         self.mfa_token = mfa_token
         self.mfa_type = mfa_type or 'device_token'
-        self.commands = []
         self.plugins = []
         self.session_token = None
         self.salt = None
@@ -126,19 +166,10 @@ class KeeperParams:
         self.data_key = None
         self.rsa_key = None
         self.revision = 0
-        self.record_cache = {}
-        self.meta_data_cache = {}
-        self.shared_folder_cache = {}
-        self.team_cache = {}
-        self.key_cache = {}  # team or user
         self.available_team_cache = None
-        self.subfolder_cache = {}
-        self.subfolder_record_cache = {}
-        self.non_shared_data_cache = {}
         self.root_folder = None
         self.current_folder = None
-        self.folder_cache = {}
-        self.debug = False
+        self.debug = debug
         self.timedelay = timedelay
         self.sync_data = True
         self.license = None
@@ -151,10 +182,6 @@ class KeeperParams:
         self.batch_mode = batch_mode
         self.device_id = device_id
         self.__rest_context = RestApiContext(server=server, device_id=device_id)
-        self.pending_share_requests = set()
-        self.environment_variables = {}
-        self.record_history = {}  # type: dict[str, (list[dict], int)]
-        self.event_queue = []
         self.logout_timer = logout_timer
         self.login_v3 = login_v3
         self.clone_code = None
@@ -167,65 +194,27 @@ class KeeperParams:
 
         config = {}
         try:
-            if os.path.exists(config_filename):
-                with open(config_filename) as config_file:
-                    config = json.load(config_file)
+            with open(config_filename, 'rb') as config_file:
+                config = _json_loads(config_file.read())
+        except FileNotFoundError:
+            pass
         except IOError as ioe:
             logging.warning('Error: Unable to open config file %s: %s.', config_filename, ioe)
         except Exception as e:
             logging.error('Unable to parse JSON configuration file "%s". Please check config for errors, and ensure the directory and config are writable.',
                 config_filename)
         else:
-            logging.debug(f'Parsed config JSON successfully: {config_filename}.')
+            logging.debug('Parsed config JSON successfully: %s.', config_filename)
 
         return cls(config_filename=config_filename, **config)
 
 
     def clear_session(self):
-        self.auth_verifier = ''
-        self.user = ''
-        self.password = ''
-        self.mfa_type = 'device_token'
-        self.mfa_token = ''
-        self.commands.clear()
-        self.session_token = None
-        self.salt = None
-        self.iterations = 0
-        self.data_key = None
-        self.rsa_key = None
-        self.revision = 0
-        self.record_cache.clear()
-        self.meta_data_cache.clear()
-        self.shared_folder_cache.clear()
-        self.team_cache.clear()
-        self.available_team_cache = None
-        self.key_cache.clear()
-        self.subfolder_cache.clear()
-        self.subfolder_record_cache.clear()
-        self.non_shared_data_cache.clear()
-        if self.folder_cache:
-            self.folder_cache.clear()
-
-        self.root_folder = None
-        self.current_folder = None
-        self.sync_data = True
-        self.license = None
-        self.settings = None
-        self.enforcements = None
-        self.enterprise = None
-        self.enterprise_id = 0
-        self.msp_tree_key = None
-        self.prepare_commands = True
-        self.batch_mode = False
-        self.pending_share_requests.clear()
-        self.environment_variables.clear()
-        self.record_history.clear()
-        self.event_queue.clear()
+        for name, _ in self._COLLECTIONS:
+            getattr(self, name).clear()
+        self.__dict__.update(self._CLEAR_STATE)
         self.logout_timer = self.config.get('logout_timer') or 0
         # self.login_v3 = self.config.get('login_v3') or True
-        self.clone_code = None
-        self.device_token = None
-        self.device_private_key = None
 
     def __get_rest_context(self):
         return self.__rest_context
@@ -235,17 +224,21 @@ class KeeperParams:
 
     def __set_server(self, value):
         self.__server = value
+        self.__domain = urlparse(value or '').netloc
         self.__rest_context.server_base = value
 
+    def __get_domain(self):
+        return self.__domain
+
     def queue_audit_event(self, name, **kwargs):
         # type: (str, dict) -> None
-        if self.license and 'account_type' in self.license:
-            if self.license['account_type'] == 2:
-                self.event_queue.append({
-                    'audit_event_type': name,
-                    'inputs': {x: kwargs[x] for x in kwargs if
-                               x in {'record_uid', 'file_format', 'attachment_id', 'to_username'}}
-                })
+        if not self.license or self.license.get('account_type') != 2:
+            return
+        self.event_queue.append({
+            'audit_event_type': name,
+            'inputs': {x: kwargs[x] for x in _AUDIT_KEYS & kwargs.keys()}
+        })
 
     server = property(__get_server, __set_server)
+    domain = property(__get_domain)
     rest_context = property(__get_rest_context)
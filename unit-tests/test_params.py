@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from keepercommander import params
+
+
+class TestKeeperParams(TestCase):
+    def test_clear_session(self):
+        p = params.KeeperParams(user='user@company.com')
+        record_cache = p.record_cache
+        record_cache['record_uid'] = {}
+        p.pending_share_requests.add('user@company.com')
+        p.event_queue.append({'audit_event_type': 'copy_password'})
+
+        p.clear_session()
+        self.assertIs(p.record_cache, record_cache)
+        self.assertEqual(len(p.record_cache), 0)
+        self.assertEqual(len(p.pending_share_requests), 0)
+        self.assertEqual(len(p.event_queue), 0)
+        self.assertEqual(p.user, '')
+
+    def test_queue_audit_event(self):
+        p = params.KeeperParams()
+        p.queue_audit_event('copy_password', record_uid='record_uid')
+        self.assertEqual(len(p.event_queue), 0)
+
+        p.license = {'account_type': 2}
+        p.queue_audit_event('copy_password', record_uid='record_uid', password='password')
+        self.assertEqual(p.event_queue, [{'audit_event_type': 'copy_password', 'inputs': {'record_uid': 'record_uid'}}])